@@ -4,16 +4,55 @@ Tile Empire NEAT Training Worker
 Adapted from evolve project for tile-empire neuroevolution
 """
 
-import copy
+import asyncio
+import atexit
+import hashlib
 import json
 import os
+import queue
 import random
+import select
+import struct
 import subprocess
 import sys
+import threading
+import time
 import uuid
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
 
+import numpy as np
 import wandb
 
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        """Serialize to JSON bytes (orjson fast path)"""
+        return orjson.dumps(obj)
+
+    def _json_loads(data):
+        """Parse JSON from bytes or str (orjson fast path)"""
+        return orjson.loads(data)
+except ImportError:  # orjson is optional; fall back to stdlib
+    def _json_dumps(obj):
+        """Serialize to JSON bytes (stdlib fallback)"""
+        return json.dumps(obj).encode()
+
+    def _json_loads(data):
+        """Parse JSON from bytes or str (stdlib fallback)"""
+        return json.loads(data)
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        def wrap(fn):
+            return fn
+        return wrap
+
 # Enable line buffering for real-time logging
 sys.stdout.reconfigure(line_buffering=True)
 sys.stderr.reconfigure(line_buffering=True)
@@ -26,6 +65,31 @@ GODOT_USER_DIR = os.environ.get("GODOT_USER_DIR", os.path.expanduser("~/.local/s
 # Generate unique worker ID
 WORKER_ID = str(uuid.uuid4())[:8]
 
+# Node genes are fixed-column records, not dicts: ~4x less memory per node
+# and no hash-table lookup on iteration. Node types live as small ints.
+KIND = {'input': 0, 'output': 1, 'hidden': 2}
+KIND_NAMES = {v: k for k, v in KIND.items()}
+
+NodeGene = namedtuple('NodeGene', 'id kind bias')
+
+# Per-episode metrics aggregated across episodes (column order of the
+# (episodes, metrics) array built in evaluate_genome)
+METRIC_KEYS = (
+    'territory_score', 'progression_score', 'survival_score',
+    'resource_efficiency', 'territory_growth_rate'
+)
+
+# Columns of the per-genome metrics table logged once per generation; the
+# verbose columns are only recorded when log_verbose is on
+PER_GENOME_COLUMNS = [
+    'genome_id', 'territory_score', 'progression_score', 'survival_score',
+    'aggregate_fitness'
+]
+PER_GENOME_VERBOSE_COLUMNS = [
+    'best_territory', 'best_progression', 'best_survival',
+    'resource_efficiency', 'territory_growth_rate'
+]
+
 # Sweep configuration
 sweep_config = {
     'method': 'bayes',
@@ -66,6 +130,86 @@ sweep_config = {
 }
 
 
+@njit(cache=True, fastmath=True)
+def _compatibility_distance(a_inn, a_w, b_inn, b_w, c1, c2, c3):
+    """NEAT compatibility distance δ = c1·E/N + c2·D/N + c3·W̄.
+
+    Merge-walk over the two innovation arrays (sorted ascending), counting
+    excess (E) and disjoint (D) genes and averaging the weight difference W̄
+    over matching genes in a single pass.
+    """
+    na = a_inn.shape[0]
+    nb = b_inn.shape[0]
+
+    i = 0
+    j = 0
+    disjoint = 0
+    matching = 0
+    weight_diff = 0.0
+
+    while i < na and j < nb:
+        if a_inn[i] == b_inn[j]:
+            weight_diff += abs(a_w[i] - b_w[j])
+            matching += 1
+            i += 1
+            j += 1
+        elif a_inn[i] < b_inn[j]:
+            disjoint += 1
+            i += 1
+        else:
+            disjoint += 1
+            j += 1
+
+    excess = (na - i) + (nb - j)
+
+    n = max(na, nb)
+    if n < 1:
+        n = 1
+    avg_weight_diff = weight_diff / matching if matching > 0 else 0.0
+
+    return c1 * excess / n + c2 * disjoint / n + c3 * avg_weight_diff
+
+
+def _distance_view(genome):
+    """Sorted (innovation, weight) arrays for compatibility comparisons"""
+    conn = genome['conn']
+    order = np.argsort(conn['inn'])
+    return conn['inn'][order], conn['w'][order]
+
+
+@dataclass(frozen=True, slots=True)
+class MutParams:
+    """Mutation-rate snapshot, taken once per generation.
+
+    Avoids repeated attribute lookups through the wandb.Config proxy on the
+    per-genome mutation path (and, unlike the proxy, is Numba-friendly).
+    """
+    w_rate: float
+    w_power: float
+    add_node: float
+    add_conn: float
+
+
+@dataclass(frozen=True, slots=True)
+class SpeciationParams:
+    """Compatibility-coefficient snapshot for one speciation pass"""
+    c1: float
+    c2: float
+    c3: float
+    threshold: float
+
+
+class Config:
+    """Plain picklable stand-in for wandb.Config (worker processes, local testing)"""
+
+    def __init__(self, d):
+        for k, v in d.items():
+            setattr(self, k, v)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
 class TileEmpireNEAT:
     """NEAT implementation for Tile Empire"""
     
@@ -79,6 +223,7 @@ class TileEmpireNEAT:
         
         self.innovation_counter = 0
         self.node_counter = 0
+        self.rng = np.random.default_rng()
         
         # Neural network structure
         self.input_size = 93  # From agent_observer.gd
@@ -87,7 +232,14 @@ class TileEmpireNEAT:
         # Initialize population
         self.population = []
         self.species = []
+        self.species_counter = 0
         self.generation = 0
+
+        # genome content hash -> (last-seen generation, metrics)
+        self._fitness_cache = {}
+
+        # Pre-generated mutation randomness, consumed through a cursor
+        self._refill_rng_pool(0)
         
         self._initialize_population()
     
@@ -102,7 +254,7 @@ class TileEmpireNEAT:
         genome = {
             'id': str(uuid.uuid4())[:8],
             'nodes': [],
-            'connections': [],
+            'conn': None,  # Structure-of-Arrays connection block, filled below
             'fitness': [0.0, 0.0, 0.0],  # Multi-objective
             'aggregate_fitness': 0.0,
             'species_id': None
@@ -110,42 +262,75 @@ class TileEmpireNEAT:
         
         # Add input nodes
         for _i in range(self.input_size):
-            genome['nodes'].append({
-                'id': self.node_counter,
-                'type': 'input',
-                'bias': 0.0
-            })
+            genome['nodes'].append(NodeGene(self.node_counter, KIND['input'], 0.0))
             self.node_counter += 1
 
-        # Add output nodes
-        for _i in range(self.output_size):
-            genome['nodes'].append({
-                'id': self.node_counter,
-                'type': 'output',
-                'bias': random.uniform(-1, 1)
-            })
+        # Add output nodes (biases drawn in one batch)
+        output_biases = self.rng.uniform(-1, 1, self.output_size)
+        for i in range(self.output_size):
+            genome['nodes'].append(
+                NodeGene(self.node_counter, KIND['output'], float(output_biases[i]))
+            )
             self.node_counter += 1
-        
-        # Add initial connections (sparse)
+
+        # Add initial connections (sparse), straight into the SoA layout
         connection_probability = 0.1  # Only connect 10% initially
-        for i in range(self.input_size):
-            for j in range(self.output_size):
-                if random.random() < connection_probability:
-                    genome['connections'].append({
-                        'innovation': self.innovation_counter,
-                        'from_node': i,
-                        'to_node': self.input_size + j,
-                        'weight': random.uniform(-2, 2),
-                        'enabled': True
-                    })
-                    self.innovation_counter += 1
-        
+        coins = self.rng.random(self.input_size * self.output_size)
+        pairs = [
+            (i, self.input_size + j)
+            for i in range(self.input_size)
+            for j in range(self.output_size)
+            if coins[i * self.output_size + j] < connection_probability
+        ]
+        n = len(pairs)
+
+        genome['conn'] = {
+            'w': self.rng.uniform(-2, 2, n).astype('f4'),
+            'en': np.ones(n, dtype='?'),
+            'inn': np.arange(self.innovation_counter, self.innovation_counter + n, dtype='i4'),
+            'src': np.array([p[0] for p in pairs], dtype='i4'),
+            'dst': np.array([p[1] for p in pairs], dtype='i4')
+        }
+        self.innovation_counter += n
+
         return genome
     
+    def _refill_rng_pool(self, n_needed):
+        """Preallocate mutation randomness in one batch.
+
+        Individual random.random()/random.uniform() calls each cross the
+        Python/C boundary; drawing a generation's worth up front and slicing
+        through a cursor amortizes that cost.
+        """
+        self._weight_noise = self.rng.uniform(-1, 1, n_needed)
+        self._perturb_coin = self.rng.random(n_needed)
+        self._rng_cursor = 0
+
+    def _draw_noise(self, n):
+        """Take n pre-generated (noise, coin) values, refilling on overrun"""
+        if self._rng_cursor + n > self._weight_noise.size:
+            self._refill_rng_pool(max(n, 2 * self._weight_noise.size))
+
+        block = slice(self._rng_cursor, self._rng_cursor + n)
+        self._rng_cursor += n
+        return self._weight_noise[block], self._perturb_coin[block]
+
     def evolve_generation(self):
         """Run one generation of evolution"""
         # Speciate
         self._speciate()
+
+        # One batch of mutation randomness for the whole generation
+        self._refill_rng_pool(2 * sum(g['conn']['w'].size for g in self.population))
+
+        # Snapshot mutation rates once instead of per-genome config lookups
+        config = self.config
+        mut_params = MutParams(
+            float(config.weight_mutation_rate),
+            float(config.weight_mutation_power),
+            float(config.add_node_rate),
+            float(config.add_connection_rate)
+        )
         
         # Create offspring
         offspring = []
@@ -163,70 +348,692 @@ class TileEmpireNEAT:
                 parent2 = self._tournament_select()
                 child = self._crossover(parent1, parent2)
             else:  # 25% asexual reproduction
-                child = copy.deepcopy(parent1)
+                child = self._clone_genome(parent1)
             
             # Mutate
-            self._mutate(child)
+            self._mutate(child, mut_params)
             
             offspring.append(child)
         
         self.population = offspring[:self.population_size]
         self.generation += 1
-    
-    def _mutate(self, genome):
+
+    def _get_elite(self):
+        """Clones of the top elite_count genomes by aggregate fitness.
+
+        Clones, not references, so an elite surviving unchanged cannot be
+        aliased by a parent picked for crossover. The content hash of a
+        clone matches its parent, so elites still hit the fitness cache.
+        """
+        elite_count = int(self.config.elite_count)
+        ranked = sorted(
+            self.population, key=lambda g: g['aggregate_fitness'], reverse=True
+        )
+        return [self._clone_genome(g) for g in ranked[:elite_count]]
+
+    def _tournament_select(self, k=3):
+        """Pick the fittest of k randomly drawn genomes"""
+        contenders = random.sample(self.population, min(k, len(self.population)))
+        return max(contenders, key=lambda g: g['aggregate_fitness'])
+
+    def _crossover(self, parent1, parent2):
+        """NEAT crossover: fitter parent's topology, matching weights mixed.
+
+        The child inherits structure (nodes, connections, disjoint/excess
+        genes) from the fitter parent; genes matching by innovation number
+        take the other parent's weight half the time.
+        """
+        if parent2['aggregate_fitness'] > parent1['aggregate_fitness']:
+            parent1, parent2 = parent2, parent1
+
+        child = self._clone_genome(parent1)
+        conn = child['conn']
+
+        _, own_idx, other_idx = np.intersect1d(
+            conn['inn'], parent2['conn']['inn'], return_indices=True
+        )
+        if own_idx.size:
+            take = self.rng.random(own_idx.size) < 0.5
+            conn['w'][own_idx[take]] = parent2['conn']['w'][other_idx[take]]
+
+        child['fitness'] = [0.0, 0.0, 0.0]
+        child['aggregate_fitness'] = 0.0
+        return child
+
+    def _clone_genome(self, genome):
+        """Typed shallow clone of a genome, much cheaper than deepcopy.
+
+        Genomes are plain dicts of node dicts and NumPy arrays with no
+        cycles or custom objects, so deepcopy's memo bookkeeping and
+        per-type dispatch are pure overhead here.
+        """
+        return {
+            'id': str(uuid.uuid4())[:8],
+            'nodes': list(genome['nodes']),  # NodeGenes are immutable
+            'conn': {k: v.copy() for k, v in genome['conn'].items()},
+            'fitness': list(genome['fitness']),
+            'aggregate_fitness': genome['aggregate_fitness'],
+            'species_id': genome['species_id']
+        }
+
+    def _speciate(self):
+        """Assign genomes to species by compatibility distance"""
+        params = SpeciationParams(
+            float(self.c1), float(self.c2), float(self.c3),
+            float(self.compatibility_threshold)
+        )
+
+        # Pre-extract sorted innovation/weight arrays once per genome instead
+        # of rebuilding them for every pairwise comparison
+        views = [_distance_view(genome) for genome in self.population]
+
+        for species in self.species:
+            species['members'] = []
+
+        for genome, (inn, w) in zip(self.population, views, strict=True):
+            placed = False
+
+            for species in self.species:
+                rep_inn, rep_w = species['representative']
+                distance = _compatibility_distance(
+                    rep_inn, rep_w, inn, w, params.c1, params.c2, params.c3
+                )
+                if distance < params.threshold:
+                    species['members'].append(genome)
+                    genome['species_id'] = species['id']
+                    placed = True
+                    break
+
+            if not placed:
+                species = {
+                    'id': self.species_counter,
+                    'representative': (inn, w),
+                    'members': [genome],
+                    'best_fitness': 0.0,
+                    'last_improved_gen': self.generation
+                }
+                self.species_counter += 1
+                self.species.append(species)
+                genome['species_id'] = species['id']
+
+        # Drop emptied species; survivors get a fresh representative and
+        # their stagnation bookkeeping updated
+        survivors = []
+        for species in self.species:
+            if not species['members']:
+                continue
+
+            best = max(m['aggregate_fitness'] for m in species['members'])
+            if best > species['best_fitness']:
+                species['best_fitness'] = best
+                species['last_improved_gen'] = self.generation
+
+            species['representative'] = _distance_view(random.choice(species['members']))
+            survivors.append(species)
+        self.species = survivors
+
+    def _mutate(self, genome, params):
         """Apply mutations to genome"""
-        config = self.config
-        
-        # Weight mutations
-        if random.random() < config.weight_mutation_rate:
-            for conn in genome['connections']:
-                if random.random() < 0.9:  # 90% perturb
-                    conn['weight'] += random.uniform(-1, 1) * config.weight_mutation_power
-                    conn['weight'] = max(-10, min(10, conn['weight']))  # Clamp
-                else:  # 10% replace
-                    conn['weight'] = random.uniform(-2, 2)
-        
+        conn = genome['conn']
+        n = conn['w'].size
+
+        # Weight mutations: one vectorized pass over the whole connection
+        # block, fed from the pre-generated noise pool
+        if n and random.random() < params.w_rate:
+            w = conn['w']
+            noise, coin = self._draw_noise(n)
+            perturb = coin < 0.9  # 90% perturb, 10% replace
+            w[perturb] += noise[perturb] * params.w_power
+            w[~perturb] = noise[~perturb] * 2  # Replacement draws are U(-2, 2)
+            np.clip(w, -10, 10, out=w)  # Clamp
+
         # Add node mutation
-        if random.random() < config.add_node_rate and genome['connections']:
-            conn = random.choice([c for c in genome['connections'] if c['enabled']])
-            self._add_node_mutation(genome, conn)
-        
+        if n and random.random() < params.add_node:
+            enabled_idx = np.flatnonzero(conn['en'])
+            if enabled_idx.size:
+                self._add_node_mutation(genome, int(self.rng.choice(enabled_idx)))
+
         # Add connection mutation
-        if random.random() < config.add_connection_rate:
+        if random.random() < params.add_conn:
             self._add_connection_mutation(genome)
-    
+
+    def _append_connections(self, genome, triples):
+        """Append (src, dst, weight) genes with fresh innovation numbers.
+
+        Innovation numbers are drawn from the monotonic counter, so the
+        appended block keeps conn['inn'] sorted ascending (which the
+        compatibility merge-walk relies on).
+        """
+        conn = genome['conn']
+        n_new = len(triples)
+
+        inn = np.arange(
+            self.innovation_counter, self.innovation_counter + n_new, dtype='i4'
+        )
+        self.innovation_counter += n_new
+
+        conn['inn'] = np.concatenate([conn['inn'], inn])
+        conn['src'] = np.concatenate(
+            [conn['src'], np.array([t[0] for t in triples], dtype='i4')]
+        )
+        conn['dst'] = np.concatenate(
+            [conn['dst'], np.array([t[1] for t in triples], dtype='i4')]
+        )
+        conn['w'] = np.concatenate(
+            [conn['w'], np.array([t[2] for t in triples], dtype='f4')]
+        )
+        conn['en'] = np.concatenate([conn['en'], np.ones(n_new, dtype='?')])
+
+    def _add_node_mutation(self, genome, conn_idx):
+        """Split the connection at conn_idx with a new hidden node.
+
+        The old gene is disabled; the in-link gets weight 1.0 and the
+        out-link inherits the old weight, so the mutation starts out
+        behavior-preserving.
+        """
+        conn = genome['conn']
+        conn['en'][conn_idx] = False
+
+        node_id = self.node_counter
+        self.node_counter += 1
+        genome['nodes'].append(NodeGene(node_id, KIND['hidden'], 0.0))
+
+        src = int(conn['src'][conn_idx])
+        dst = int(conn['dst'][conn_idx])
+        old_w = float(conn['w'][conn_idx])
+
+        self._append_connections(genome, [(src, node_id, 1.0), (node_id, dst, old_w)])
+
+    def _add_connection_mutation(self, genome):
+        """Add a connection between two not-yet-connected nodes.
+
+        A few random (source, target) draws are tried; if they all land on
+        existing or self connections the mutation is skipped this round.
+        """
+        nodes = genome['nodes']
+        sources = [n.id for n in nodes if n.kind != KIND['output']]
+        targets = [n.id for n in nodes if n.kind != KIND['input']]
+
+        conn = genome['conn']
+        existing = set(zip(conn['src'].tolist(), conn['dst'].tolist(), strict=True))
+
+        for _attempt in range(10):
+            src = random.choice(sources)
+            dst = random.choice(targets)
+            if src != dst and (src, dst) not in existing:
+                self._append_connections(genome, [(src, dst, random.uniform(-2, 2))])
+                return
+
     def save_population(self, filepath):
-        """Save population to JSON"""
+        """Save population to disk.
+
+        The default format is compressed npz: the connection arrays go in
+        columnar, as-is, with a small JSON header for scalar metadata, which
+        is several times smaller and faster than the repeated-key JSON dump.
+        A .json extension keeps the legacy format for interop.
+        """
+        if str(filepath).endswith('.json'):
+            self.save_population_json(filepath)
+            return
+
+        arrays = {}
+        meta = []
+
+        for i, genome in enumerate(self.population):
+            conn = genome['conn']
+            arrays[f'g{i}_w'] = conn['w']
+            arrays[f'g{i}_en'] = conn['en']
+            arrays[f'g{i}_inn'] = conn['inn']
+            arrays[f'g{i}_src'] = conn['src']
+            arrays[f'g{i}_dst'] = conn['dst']
+            meta.append({
+                'id': genome['id'],
+                'nodes': _nodes_to_json(genome['nodes']),
+                'fitness': genome['fitness'],
+                'aggregate_fitness': genome['aggregate_fitness'],
+                'species_id': genome['species_id']
+            })
+
+        header = {
+            'generation': self.generation,
+            'innovation_counter': self.innovation_counter,
+            'node_counter': self.node_counter,
+            'population': meta
+        }
+        arrays['header'] = np.frombuffer(_json_dumps(header), dtype=np.uint8)
+
+        np.savez_compressed(filepath, **arrays)
+
+    def save_population_json(self, filepath):
+        """Save population in the legacy JSON format"""
         data = {
             'generation': self.generation,
-            'population': self.population,
+            'population': [_genome_to_json(g) for g in self.population],
             'innovation_counter': self.innovation_counter,
             'node_counter': self.node_counter
         }
-        
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
 
+        # No pretty-printing: this runs on the hot save path and indentation
+        # multiplies both file size and serialization time
+        with open(filepath, 'wb') as f:
+            f.write(_json_dumps(data))
+
+    def load_population(self, filepath):
+        """Restore a population saved by save_population (.npz or legacy .json)"""
+        if str(filepath).endswith('.json'):
+            with open(filepath, 'rb') as f:
+                data = _json_loads(f.read())
+
+            self.generation = data['generation']
+            self.innovation_counter = data['innovation_counter']
+            self.node_counter = data['node_counter']
+            self.population = [_genome_from_json(g) for g in data['population']]
+            return
+
+        archive = np.load(filepath, allow_pickle=False)
+        header = _json_loads(bytes(archive['header']))
+
+        self.generation = header['generation']
+        self.innovation_counter = header['innovation_counter']
+        self.node_counter = header['node_counter']
+
+        self.population = []
+        for i, meta in enumerate(header['population']):
+            self.population.append({
+                'id': meta['id'],
+                'nodes': _nodes_from_json(meta['nodes']),
+                'conn': {
+                    'w': archive[f'g{i}_w'],
+                    'en': archive[f'g{i}_en'],
+                    'inn': archive[f'g{i}_inn'],
+                    'src': archive[f'g{i}_src'],
+                    'dst': archive[f'g{i}_dst']
+                },
+                'fitness': meta['fitness'],
+                'aggregate_fitness': meta['aggregate_fitness'],
+                'species_id': meta['species_id']
+            })
+
+
+def _nodes_to_json(nodes):
+    """Node genes in the JSON dict schema (kind ints back to type names)"""
+    return [{'id': n.id, 'type': KIND_NAMES[n.kind], 'bias': n.bias} for n in nodes]
+
+
+def _nodes_from_json(nodes):
+    """Node genes from the JSON dict schema back to packed records"""
+    return [NodeGene(n['id'], KIND[n['type']], n['bias']) for n in nodes]
+
+
+def _genome_from_json(data):
+    """Inverse of _genome_to_json: rebuild the packed in-memory genome"""
+    conns = data.get('connections', [])
+    return {
+        'id': data['id'],
+        'nodes': _nodes_from_json(data['nodes']),
+        'conn': {
+            'w': np.array([c['weight'] for c in conns], dtype='f4'),
+            'en': np.array([c['enabled'] for c in conns], dtype='?'),
+            'inn': np.array([c['innovation'] for c in conns], dtype='i4'),
+            'src': np.array([c['from_node'] for c in conns], dtype='i4'),
+            'dst': np.array([c['to_node'] for c in conns], dtype='i4')
+        },
+        'fitness': data.get('fitness', [0.0, 0.0, 0.0]),
+        'aggregate_fitness': data.get('aggregate_fitness', 0.0),
+        'species_id': data.get('species_id')
+    }
+
+
+def _genome_hash(genome):
+    """Content hash of a genome's heritable structure.
+
+    Volatile bookkeeping fields (id, fitness, species assignment) are
+    excluded so carried-over elites and unmutated clones hash identically
+    to their parent.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(_json_dumps([list(n) for n in genome['nodes']]))
+    conn = genome['conn']
+    for key in ('inn', 'src', 'dst', 'w', 'en'):
+        h.update(conn[key].tobytes())
+    return h.digest()
+
+
+def _genome_to_json(genome):
+    """Expand a genome to the JSON schema the Godot side expects.
+
+    Connections live in a NumPy Structure-of-Arrays block and node genes as
+    packed records in memory; both are converted back to the list-of-dicts
+    form only at this serialization boundary.
+    """
+    conn = genome['conn']
+    out = {k: v for k, v in genome.items() if k not in ('conn', 'nodes')}
+    out['nodes'] = _nodes_to_json(genome['nodes'])
+    out['connections'] = [
+        {
+            'innovation': int(conn['inn'][i]),
+            'from_node': int(conn['src'][i]),
+            'to_node': int(conn['dst'][i]),
+            'weight': float(conn['w'][i]),
+            'enabled': bool(conn['en'][i])
+        }
+        for i in range(conn['w'].size)
+    ]
+    return out
+
+
+def _print_episode_metrics(episode, metrics):
+    """Print the one-line summary for a finished episode"""
+    print(f"Episode {episode + 1}: T={metrics['territory_score']:.3f} "
+          f"P={metrics['progression_score']:.3f} S={metrics['survival_score']:.3f} "
+          f"RE={metrics.get('resource_efficiency', 0):.3f} "
+          f"GR={metrics.get('territory_growth_rate', 0):.3f}")
+
+
+class GodotDaemon:
+    """Persistent headless Godot worker driven over stdio.
+
+    Keeps one Godot process alive per worker and feeds it one episode
+    request per line (newline-delimited JSON), reading metrics back from
+    stdout. Each episode then skips the Godot cold start (asset import,
+    script parsing, scene tree init) that a subprocess launch pays.
+    """
+
+    METRICS_PREFIX = b"##METRICS##"
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.proc = None
+        self._stdout_buf = b""
+
+    def _launch(self):
+        cmd = [
+            GODOT_PATH,
+            "--path", PROJECT_PATH,
+            "--headless",
+            "--",
+            "--training",
+            "--daemon",
+            "--worker-id", self.worker_id
+        ]
+        # Pipes stay binary and unbuffered on the Python side: stdout is
+        # drained with os.read below, and a buffering TextIOWrapper would
+        # make select() lie about readability (readline can slurp several
+        # lines into user space that select never sees again)
+        self.proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._stdout_buf = b""
+
+    def ensure_alive(self):
+        """(Re)launch Godot if it has not started yet or has crashed"""
+        if self.proc is None or self.proc.poll() is not None:
+            self._launch()
+
+    def _next_line(self, deadline):
+        """Next complete stdout line, or None on timeout/EOF.
+
+        Reads the raw fd and splits lines in an internal buffer, so a single
+        wakeup that delivers several lines (or a partial one) is handled
+        correctly.
+        """
+        while True:
+            nl = self._stdout_buf.find(b"\n")
+            if nl >= 0:
+                line = self._stdout_buf[:nl]
+                self._stdout_buf = self._stdout_buf[nl + 1:]
+                return line
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            ready, _, _ = select.select([self.proc.stdout], [], [], min(remaining, 1.0))
+            if not ready:
+                if self.proc.poll() is not None:
+                    return None
+                continue
+
+            chunk = os.read(self.proc.stdout.fileno(), 65536)
+            if not chunk:  # EOF - Godot died
+                return None
+            self._stdout_buf += chunk
+
+    def run_episode(self, request, timeout_seconds):
+        """Send one episode request and wait for its metrics reply.
+
+        Returns the metrics dict, or None on crash/timeout (the daemon is
+        restarted so the rest of the generation survives).
+        """
+        self.ensure_alive()
+
+        try:
+            self.proc.stdin.write(_json_dumps(request) + b"\n")
+            self.proc.stdin.flush()
+
+            deadline = time.monotonic() + timeout_seconds
+            while True:
+                line = self._next_line(deadline)
+                if line is None:
+                    break
+                if line.startswith(self.METRICS_PREFIX):
+                    return _json_loads(line[len(self.METRICS_PREFIX):])
+                # Anything else is ordinary Godot logging - ignore
+
+        except (OSError, ValueError) as e:
+            print(f"Daemon error - {e}")
+
+        self.restart()
+        return None
+
+    def restart(self):
+        """Kill the current Godot process; next episode relaunches it"""
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+        self._stdout_buf = b""
+
+    def close(self):
+        """Shut the daemon down for good: close stdin so Godot quits, then reap"""
+        if self.proc is None:
+            return
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.close()  # EOF makes the Godot side quit cleanly
+                self.proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+        self.proc = None
+        self._stdout_buf = b""
+
+
+# The persistent daemon, one per OS process (pool workers each get their
+# own). Keyed by pid, not per-genome worker id, so every evaluation in a
+# process reuses the same warm Godot instead of launching a fresh one.
+_daemons = {}
+
+
+def _get_daemon():
+    """This process's persistent Godot daemon, created on first use"""
+    pid = os.getpid()
+    daemon = _daemons.get(pid)
+    if daemon is None:
+        daemon = _daemons[pid] = GodotDaemon(f"{WORKER_ID}_{pid}")
+        atexit.register(daemon.close)
+    return daemon
+
+
+def _run_episodes_daemon(genome, config, timeout_seconds):
+    """Run all episodes for a genome through the persistent Godot daemon"""
+    daemon = _get_daemon()
 
-def evaluate_genome(genome, config, worker_id):
-    """Evaluate a single genome by running Godot"""
-    # Write genome to file
-    genome_path = os.path.join(GODOT_USER_DIR, f"genome_{worker_id}.json")
-    metrics_path = os.path.join(GODOT_USER_DIR, f"metrics_{worker_id}.json")
-    
-    os.makedirs(os.path.dirname(genome_path), exist_ok=True)
-    
-    with open(genome_path, 'w') as f:
-        json.dump(genome, f)
-    
-    # Clear old metrics
-    if os.path.exists(metrics_path):
-        os.remove(metrics_path)
-    
-    # Run multiple episodes for more robust evaluation
     all_metrics = []
-    
+
+    for episode in range(config.eval_episodes):
+        request = {
+            'genome': _genome_to_json(genome),
+            'seed': random.randint(0, 999999),
+            'max_ticks': config.max_episode_ticks,
+            'action_interval': config.action_interval,
+            'map_size': config.map_size,
+        }
+
+        if hasattr(config, 'disable_cpu') and config.disable_cpu:
+            request['disable_cpu'] = True
+        else:
+            request['cpu_difficulty'] = config.cpu_difficulty
+
+        metrics = daemon.run_episode(request, timeout_seconds)
+
+        if metrics:
+            _print_episode_metrics(episode, metrics)
+            all_metrics.append(metrics)
+        else:
+            print(f"Episode {episode + 1}: No metrics from daemon")
+
+    return all_metrics
+
+
+# Shared-memory transport layout: genome blob at the front (length-prefixed),
+# one metrics slot per episode in a reserved tail region. Linux-only (Godot
+# reads the segment through /dev/shm).
+SHM_SIZE = 1_048_576
+SHM_METRICS_OFFSET = SHM_SIZE - 256 * 1024
+SHM_METRICS_SLOT_SIZE = 64 * 1024
+
+
+def _create_genome_shm(genome, worker_id):
+    """Allocate the shared segment and write the length-prefixed genome blob"""
+    name = f"tile_empire_{worker_id}"
+
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=SHM_SIZE, name=name)
+    except FileExistsError:
+        # Stale segment from a crashed worker - reclaim it
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        shm = shared_memory.SharedMemory(create=True, size=SHM_SIZE, name=name)
+
+    blob = _json_dumps(genome)
+    if len(blob) + 4 > SHM_METRICS_OFFSET:
+        shm.close()
+        shm.unlink()
+        raise ValueError(f"Genome blob ({len(blob)} bytes) exceeds shm genome region")
+
+    struct.pack_into('<I', shm.buf, 0, len(blob))
+    shm.buf[4:4 + len(blob)] = blob
+
+    # Zero the slot headers so stale metrics are never parsed
+    n_slots = (SHM_SIZE - SHM_METRICS_OFFSET) // SHM_METRICS_SLOT_SIZE
+    for slot in range(n_slots):
+        struct.pack_into('<I', shm.buf, SHM_METRICS_OFFSET + slot * SHM_METRICS_SLOT_SIZE, 0)
+
+    return shm
+
+
+def _read_shm_metrics(shm, slot):
+    """Read one episode's metrics record from its shared-memory slot"""
+    offset = SHM_METRICS_OFFSET + slot * SHM_METRICS_SLOT_SIZE
+    (length,) = struct.unpack_from('<I', shm.buf, offset)
+
+    if length == 0 or length > SHM_METRICS_SLOT_SIZE - 4:
+        return None
+
+    try:
+        return _json_loads(bytes(shm.buf[offset + 4:offset + 4 + length]))
+    except ValueError:
+        return None
+
+
+async def _run_episode(cmd, episode, timeout_seconds, read_metrics):
+    """Run one Godot episode subprocess and collect its metrics"""
+    try:
+        # Metrics come back via file/shm, so Godot's output is pure overhead;
+        # discard it instead of buffering pipes we never read
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=timeout_seconds)
+        except TimeoutError:
+            proc.kill()
+            await proc.wait()
+            print(f"Episode {episode + 1}: Timeout after {timeout_seconds}s")
+            return None
+
+        metrics = read_metrics()
+        if metrics is not None:
+            _print_episode_metrics(episode, metrics)
+            return metrics
+
+        print(f"Episode {episode + 1}: No metrics produced")
+        return None
+
+    except Exception as e:
+        print(f"Episode {episode + 1}: Error - {e}")
+        return None
+
+
+def _read_metrics_file(metrics_path):
+    """Read a metrics JSON file if the episode produced one"""
+    if not os.path.exists(metrics_path):
+        return None
+    with open(metrics_path, 'rb') as f:
+        return _json_loads(f.read())
+
+
+def _run_episodes_subprocess(genome, config, worker_id, timeout_seconds):
+    """Run all episodes for a genome as one-shot Godot subprocesses"""
+    transport = config.get('transport', 'file')
+    genome_json = _genome_to_json(genome)
+    shm = None
+
+    if transport == 'shm':
+        shm = _create_genome_shm(genome_json, worker_id)
+    else:
+        # Write genome to file
+        genome_path = os.path.join(GODOT_USER_DIR, f"genome_{worker_id}.json")
+
+        os.makedirs(os.path.dirname(genome_path), exist_ok=True)
+
+        with open(genome_path, 'wb') as f:
+            f.write(_json_dumps(genome_json))
+
+    # Each episode uses a distinct map seed, so all episodes for this genome
+    # can run concurrently; only the metrics slot/path has to be episode-scoped.
+    episode_cmds = []
+    episode_readers = []
+
     for episode in range(config.eval_episodes):
+        if transport == 'shm':
+            io_args = [
+                "--transport", "shm",
+                "--shm-name", shm.name,
+                "--shm-slot", str(episode)
+            ]
+            episode_readers.append(lambda shm=shm, ep=episode: _read_shm_metrics(shm, ep))
+        else:
+            metrics_path = os.path.join(GODOT_USER_DIR, f"metrics_{worker_id}_{episode}.json")
+
+            # Clear old metrics
+            if os.path.exists(metrics_path):
+                os.remove(metrics_path)
+
+            io_args = [
+                "--genome-path", genome_path,
+                "--metrics-path", metrics_path
+            ]
+            episode_readers.append(lambda path=metrics_path: _read_metrics_file(path))
+
         # Build Godot command
         cmd = [
             GODOT_PATH,
@@ -234,75 +1041,309 @@ def evaluate_genome(genome, config, worker_id):
             "--headless",
             "--",
             "--training",
-            "--genome-path", genome_path,
-            "--metrics-path", metrics_path,
+            *io_args,
             "--max-ticks", str(config.max_episode_ticks),
             "--action-interval", str(config.action_interval),
             "--map-size", config.map_size,
             "--map-seed", str(random.randint(0, 999999)),  # Random seed per episode
-            "--worker-id", worker_id
+            "--worker-id", f"{worker_id}_{episode}"
         ]
-        
+
         if hasattr(config, 'disable_cpu') and config.disable_cpu:
             cmd.append("--disable-cpu")
         else:
             cmd.extend(["--cpu-difficulty", config.cpu_difficulty])
-        
-        # Run Godot
-        timeout_seconds = (config.max_episode_ticks / 60.0) + 30  # Episode time + buffer
-        
-        try:
-            subprocess.run(cmd, capture_output=True, timeout=timeout_seconds)
 
-            # Read metrics
-            if os.path.exists(metrics_path):
-                with open(metrics_path) as f:
-                    metrics = json.load(f)
-                    all_metrics.append(metrics)
-                    
-                    print(f"Episode {episode + 1}: T={metrics['territory_score']:.3f} "
-                          f"P={metrics['progression_score']:.3f} S={metrics['survival_score']:.3f} "
-                          f"RE={metrics.get('resource_efficiency', 0):.3f} "
-                          f"GR={metrics.get('territory_growth_rate', 0):.3f}")
-            else:
-                print(f"Episode {episode + 1}: No metrics file generated")
-                
-        except subprocess.TimeoutExpired:
-            print(f"Episode {episode + 1}: Timeout after {timeout_seconds}s")
-        except Exception as e:
-            print(f"Episode {episode + 1}: Error - {e}")
-    
-    # Aggregate metrics across episodes
+        episode_cmds.append(cmd)
+
+    async def _run_all_episodes():
+        return await asyncio.gather(*[
+            _run_episode(episode_cmds[ep], ep, timeout_seconds, episode_readers[ep])
+            for ep in range(config.eval_episodes)
+        ])
+
+    try:
+        results = asyncio.run(_run_all_episodes())
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return [m for m in results if m is not None]
+
+
+def evaluate_genome(genome, config, worker_id):
+    """Evaluate a single genome by running Godot"""
+    timeout_seconds = (config.max_episode_ticks / 60.0) + 30  # Episode time + buffer
+
+    if config.get('persistent_worker', True):
+        all_metrics = _run_episodes_daemon(genome, config, timeout_seconds)
+    else:
+        all_metrics = _run_episodes_subprocess(genome, config, worker_id, timeout_seconds)
+
+    return _aggregate_metrics(all_metrics, config)
+
+
+def _aggregate_metrics(all_metrics, config):
+    """Aggregate a genome's episode metrics into its fitness summary"""
+    # One (episodes, metrics) array and two vector ops instead of a Python
+    # iteration per metric
     if all_metrics:
-        avg_metrics = {
-            'territory_score': sum(m['territory_score'] for m in all_metrics) / len(all_metrics),
-            'progression_score': sum(m['progression_score'] for m in all_metrics) / len(all_metrics),
-            'survival_score': sum(m['survival_score'] for m in all_metrics) / len(all_metrics),
-        }
-        
+        arr = np.array(
+            [[m.get(k, 0.0) for k in METRIC_KEYS] for m in all_metrics],
+            dtype='f4'
+        )
+        mean = arr.mean(0)
+        best = arr.max(0)
+
+        avg_metrics = dict(zip(METRIC_KEYS[:3], mean[:3].tolist(), strict=True))
+
         # Calculate aggregate fitness
         avg_metrics['aggregate_fitness'] = (
             avg_metrics['territory_score'] * config.territory_weight +
             avg_metrics['progression_score'] * config.progression_weight +
             avg_metrics['survival_score'] * config.survival_weight
         )
-        
+
         # Include best episode scores
-        avg_metrics['best_territory'] = max(m['territory_score'] for m in all_metrics)
-        avg_metrics['best_progression'] = max(m['progression_score'] for m in all_metrics)
-        avg_metrics['best_survival'] = max(m['survival_score'] for m in all_metrics)
-        avg_metrics['avg_resource_efficiency'] = sum(m.get('resource_efficiency', 0) for m in all_metrics) / len(all_metrics)
-        avg_metrics['avg_territory_growth_rate'] = sum(m.get('territory_growth_rate', 0) for m in all_metrics) / len(all_metrics)
-        
+        avg_metrics['best_territory'] = float(best[0])
+        avg_metrics['best_progression'] = float(best[1])
+        avg_metrics['best_survival'] = float(best[2])
+        avg_metrics['avg_resource_efficiency'] = float(mean[3])
+        avg_metrics['avg_territory_growth_rate'] = float(mean[4])
+
         return avg_metrics
-    
+
     return None
 
 
+def _evaluate_genome_task(args):
+    """Unpack-and-call wrapper for ProcessPoolExecutor.map"""
+    genome, config_dict, worker_id = args
+    return evaluate_genome(genome, Config(config_dict), worker_id)
+
+
+# The evaluation pool lives for the whole run: tearing it down between
+# generations would kill the worker processes and the per-process Godot
+# daemons they keep warm.
+_executor = None
+
+
+def _get_executor():
+    """The long-lived evaluation pool, created on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _executor
+
+
+def _shutdown_executor():
+    """Tear down the evaluation pool (worker daemons exit via atexit/EOF)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def evaluate_population_batch(population, config):
+    """Evaluate many genomes per Godot launch (TensorNEAT-style batching).
+
+    The whole population ships to Godot as one JSON array and the Godot side
+    (--batch-mode) runs one world per genome within a single process,
+    writing an index-keyed metrics array back. This replaces
+    pop_size x eval_episodes process launches per generation with
+    eval_episodes launches, removing startup cost as the dominant term.
+
+    Returns a list of aggregated metrics dicts aligned with the population.
+    """
+    genomes_path = os.path.join(GODOT_USER_DIR, f"population_{WORKER_ID}.json")
+    os.makedirs(GODOT_USER_DIR, exist_ok=True)
+
+    with open(genomes_path, 'wb') as f:
+        f.write(_json_dumps([_genome_to_json(g) for g in population]))
+
+    episode_seconds = (config.max_episode_ticks / 60.0) + 30
+    # The Godot side runs its worlds strictly sequentially, so one launch
+    # needs time for the whole population
+    batch_timeout = episode_seconds * max(1, len(population))
+
+    per_episode = []
+
+    for episode in range(config.eval_episodes):
+        metrics_path = os.path.join(GODOT_USER_DIR, f"batch_metrics_{WORKER_ID}_{episode}.json")
+
+        if os.path.exists(metrics_path):
+            os.remove(metrics_path)
+
+        cmd = [
+            GODOT_PATH,
+            "--path", PROJECT_PATH,
+            "--headless",
+            "--",
+            "--training",
+            "--batch-mode",
+            "--genomes-path", genomes_path,
+            "--metrics-path", metrics_path,
+            "--max-ticks", str(config.max_episode_ticks),
+            "--action-interval", str(config.action_interval),
+            "--map-size", config.map_size,
+            "--map-seed", str(random.randint(0, 999999)),  # Shared within the episode
+            "--worker-id", f"{WORKER_ID}_{episode}"
+        ]
+
+        if hasattr(config, 'disable_cpu') and config.disable_cpu:
+            cmd.append("--disable-cpu")
+        else:
+            cmd.extend(["--cpu-difficulty", config.cpu_difficulty])
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            proc.wait(timeout=batch_timeout)
+        except subprocess.TimeoutExpired:
+            print(f"Batch episode {episode + 1}: Timeout after {batch_timeout}s")
+            proc.kill()
+            proc.wait()
+
+        data = _read_metrics_file(metrics_path) or []
+        per_episode.append({
+            int(m.get('genome_index', k)): m for k, m in enumerate(data)
+        })
+        print(f"Batch episode {episode + 1}: {len(data)}/{len(population)} genomes scored")
+
+    return [
+        _aggregate_metrics([ep[i] for ep in per_episode if i in ep], config)
+        for i in range(len(population))
+    ]
+
+
+# Cache entries not hit for this many generations are expired
+FITNESS_CACHE_GENERATIONS = 5
+
+# Species with no fitness improvement for this many generations are
+# considered stagnated and their offspring skip evaluation
+STAGNATION_GENERATIONS = 15
+
+
+def evaluate_population(population, config, fitness_cache=None, generation=0):
+    """Evaluate a population, in parallel across CPU cores when possible.
+
+    Returns a list of metrics dicts (or None) aligned with the population.
+    Each worker gets a unique id so genome/metrics files do not collide.
+
+    When a fitness cache is given, genomes whose heritable content was
+    evaluated recently (carried-over elites, unmutated clones) reuse the
+    cached metrics instead of launching Godot again.
+    """
+    results = [None] * len(population)
+    pending = list(range(len(population)))
+    hashes = None
+
+    if fitness_cache is not None:
+        hashes = [_genome_hash(genome) for genome in population]
+        pending = []
+
+        for i, h in enumerate(hashes):
+            hit = fitness_cache.get(h)
+            if hit is not None:
+                fitness_cache[h] = (generation, hit[1])  # refresh
+                results[i] = hit[1]
+            else:
+                pending.append(i)
+
+        if len(pending) < len(population):
+            print(f"Reusing cached fitness for {len(population) - len(pending)} genome(s)")
+
+    if config.get('batch_mode', False) and pending:
+        pending_results = evaluate_population_batch([population[i] for i in pending], config)
+    elif config.get('parallel', True) and len(pending) > 1:
+        config_dict = dict(config)
+        task_args = [
+            (population[i], config_dict, f"{WORKER_ID}_{i}")
+            for i in pending
+        ]
+        pending_results = list(_get_executor().map(_evaluate_genome_task, task_args))
+    else:
+        pending_results = []
+        for n, i in enumerate(pending):
+            print(f"Evaluating genome {n + 1}/{len(pending)}...")
+            pending_results.append(evaluate_genome(population[i], config, WORKER_ID))
+
+    for i, metrics in zip(pending, pending_results, strict=True):
+        results[i] = metrics
+        if fitness_cache is not None and metrics:
+            fitness_cache[hashes[i]] = (generation, metrics)
+
+    if fitness_cache is not None:
+        stale = [
+            h for h, (last_seen, _) in fitness_cache.items()
+            if generation - last_seen > FITNESS_CACHE_GENERATIONS
+        ]
+        for h in stale:
+            del fitness_cache[h]
+
+    return results
+
+
+def _prewarm_godot():
+    """Run a no-op Godot launch so the first real evaluation starts warm.
+
+    The first launch of the day pays .import parsing, script cache and
+    shader cache; doing it once up front leaves the OS page cache holding
+    .godot/imported/* for every subsequent evaluation. Redundant when the
+    persistent daemon is in use (its initial launch warms the same caches),
+    so this only matters for the one-shot subprocess transports.
+    """
+    cmd = [GODOT_PATH, "--path", PROJECT_PATH, "--headless", "--quit-after", "1"]
+
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=60)
+    except (subprocess.TimeoutExpired, OSError) as e:
+        print(f"Godot pre-warm skipped - {e}")
+
+
+def _log_worker(log_q):
+    """Consume queued generation logs and emit them to W&B off the hot path.
+
+    Table construction and the wandb.log network roundtrip happen here, on a
+    daemon thread, so the training loop only pays for a queue insert.
+    """
+    while True:
+        item = log_q.get()
+
+        # Every item gets its task_done, whatever happens while handling
+        # it -- a raise before task_done would leave log_q.join() (and the
+        # end of train()) blocked forever
+        try:
+            if item is None:  # Sentinel: drain complete, stop
+                break
+
+            payload, rows, columns, step = item
+            try:
+                if rows:
+                    payload['per_genome_metrics'] = wandb.Table(
+                        columns=columns, data=rows
+                    )
+                wandb.log(payload, step=step)
+            except Exception as e:
+                print(f"W&B log failed - {e}")
+        finally:
+            log_q.task_done()
+
+
 def train():
     """Main training loop"""
     wandb.init()
     config = wandb.config
+
+    # Warm the project cache before the first evaluation; the persistent
+    # daemon warms it with its own initial launch, so only the one-shot
+    # subprocess transports need this
+    if config.get('prewarm', True) and not config.get('persistent_worker', True):
+        _prewarm_godot()
+
+    # Logging runs on a background thread so it hides behind subprocess waits
+    log_q = queue.Queue()
+    threading.Thread(target=_log_worker, args=(log_q,), daemon=True).start()
     
     # Create NEAT instance
     neat = TileEmpireNEAT(config)
@@ -316,12 +1357,39 @@ def train():
         # Evaluate population
         gen_best_fitness = 0.0
         gen_avg_fitness = 0.0
-        
-        for i, genome in enumerate(neat.population):
-            print(f"Evaluating genome {i + 1}/{len(neat.population)}...")
-            
-            metrics = evaluate_genome(genome, config, WORKER_ID)
-            
+
+        log_verbose = config.get('log_verbose', False)
+        per_genome_columns = PER_GENOME_COLUMNS + (
+            PER_GENOME_VERBOSE_COLUMNS if log_verbose else []
+        )
+        per_genome_rows = []
+
+        # Stagnated-species culling: offspring of species that have not
+        # improved in STAGNATION_GENERATIONS inherit a discounted
+        # species-best fitness instead of launching Godot at all
+        stagnant = {
+            s['id']: s['best_fitness'] for s in neat.species
+            if generation - s['last_improved_gen'] >= STAGNATION_GENERATIONS
+        }
+
+        eval_indices = [
+            i for i, g in enumerate(neat.population)
+            if g['species_id'] not in stagnant
+        ]
+        if len(eval_indices) < len(neat.population):
+            print(f"Culling {len(neat.population) - len(eval_indices)} genome(s) "
+                  f"from stagnated species")
+
+        eval_results = evaluate_population(
+            [neat.population[i] for i in eval_indices],
+            config, neat._fitness_cache, generation
+        )
+
+        results = [None] * len(neat.population)
+        for i, metrics in zip(eval_indices, eval_results, strict=True):
+            results[i] = metrics
+
+        for i, (genome, metrics) in enumerate(zip(neat.population, results, strict=True)):
             if metrics:
                 genome['fitness'] = [
                     metrics['territory_score'],
@@ -329,26 +1397,33 @@ def train():
                     metrics['survival_score']
                 ]
                 genome['aggregate_fitness'] = metrics['aggregate_fitness']
-                
+
                 gen_avg_fitness += genome['aggregate_fitness']
                 if genome['aggregate_fitness'] > gen_best_fitness:
                     gen_best_fitness = genome['aggregate_fitness']
-                    
-                # Log to W&B
-                wandb.log({
-                    'generation': generation,
-                    'genome_id': i,
-                    'territory_score': metrics['territory_score'],
-                    'progression_score': metrics['progression_score'],
-                    'survival_score': metrics['survival_score'],
-                    'aggregate_fitness': metrics['aggregate_fitness'],
-                    'best_territory': metrics.get('best_territory', 0),
-                    'best_progression': metrics.get('best_progression', 0),
-                    'best_survival': metrics.get('best_survival', 0),
-                    'resource_efficiency': metrics.get('avg_resource_efficiency', 0),
-                    'territory_growth_rate': metrics.get('avg_territory_growth_rate', 0),
-                })
-        
+
+                # Buffer per-genome metrics; one batched wandb.log per
+                # generation instead of one flush per genome
+                row = [
+                    i,
+                    metrics['territory_score'],
+                    metrics['progression_score'],
+                    metrics['survival_score'],
+                    metrics['aggregate_fitness'],
+                ]
+                if log_verbose:
+                    row.extend([
+                        metrics.get('best_territory', 0),
+                        metrics.get('best_progression', 0),
+                        metrics.get('best_survival', 0),
+                        metrics.get('avg_resource_efficiency', 0),
+                        metrics.get('avg_territory_growth_rate', 0),
+                    ])
+                per_genome_rows.append(row)
+            elif genome['species_id'] in stagnant:
+                genome['aggregate_fitness'] = stagnant[genome['species_id']] * 0.9
+                gen_avg_fitness += genome['aggregate_fitness']
+
         gen_avg_fitness /= len(neat.population)
         
         # Track improvement
@@ -357,19 +1432,21 @@ def train():
             generations_without_improvement = 0
             
             # Save best genome
-            neat.save_population(os.path.join(GODOT_USER_DIR, f"best_population_gen{generation}.json"))
+            neat.save_population(os.path.join(GODOT_USER_DIR, f"best_population_gen{generation}.npz"))
         else:
             generations_without_improvement += 1
         
-        # Log generation summary
-        wandb.log({
+        # Enqueue the generation summary plus per-genome rows; the log
+        # worker builds the table and talks to W&B
+        gen_log = {
             'generation': generation,
             'gen_best_fitness': gen_best_fitness,
             'gen_avg_fitness': gen_avg_fitness,
             'best_aggregate_fitness': best_ever_fitness,
             'generations_without_improvement': generations_without_improvement,
             'species_count': len(neat.species)
-        })
+        }
+        log_q.put((gen_log, per_genome_rows, per_genome_columns, generation))
         
         print(f"Generation {generation + 1} complete. Best: {gen_best_fitness:.3f}, Avg: {gen_avg_fitness:.3f}")
         
@@ -381,8 +1458,16 @@ def train():
         # Evolve to next generation
         neat.evolve_generation()
     
+    # Drain pending logs before finishing the run
+    log_q.put(None)
+    log_q.join()
+
     # Save final population
-    neat.save_population(os.path.join(GODOT_USER_DIR, "final_population.json"))
+    neat.save_population(os.path.join(GODOT_USER_DIR, "final_population.npz"))
+
+    # Release the evaluation pool (and with it the workers' Godot daemons)
+    _shutdown_executor()
+
     print(f"Training complete! Best fitness: {best_ever_fitness:.3f}")
 
 
@@ -426,14 +1511,6 @@ def main():
             'eval_episodes': 1
         }
         
-        class Config:
-            def __init__(self, d):
-                for k, v in d.items():
-                    setattr(self, k, v)
-            
-            def get(self, key, default=None):
-                return getattr(self, key, default)
-        
         neat = TileEmpireNEAT(Config(test_config))
         
         # Test single evaluation
@@ -10,6 +10,7 @@ import sys
 # Add evolve-core to path
 sys.path.insert(0, os.path.expanduser("~/projects/evolve-core/python"))
 
+import numpy as np
 import wandb
 from evolve_core import FitnessAggregator, GodotWorker, NEATEvolution, NEATGenome, NSGA2Selection
 
@@ -19,6 +20,44 @@ PROJECT_PATH = os.environ.get("TILE_EMPIRE_PATH", os.path.expanduser("~/Projects
 GODOT_USER_DIR = os.environ.get("GODOT_USER_DIR", os.path.expanduser("~/.local/share/godot/app_userdata/TileEmpire"))
 
 
+def _non_dominated_sort(population_data):
+    """Vectorized NSGA-II non-dominated sort (maximization).
+
+    Shadows evolve_core's O(M·N²) nested-loop sort: the full pairwise
+    domination matrix comes out of one NumPy broadcast (i dominates j when
+    no objective is worse and at least one is strictly better), and fronts
+    are peeled off with a loop over the number of fronts rather than the
+    number of individuals. Returns a list of fronts, each a list of
+    population_data entries, like NSGA2Selection.non_dominated_sort.
+    """
+    if not population_data:
+        return []
+
+    fitness = np.array([p['fitness'] for p in population_data], dtype='f4')
+    n = fitness.shape[0]
+
+    ge = (fitness[:, None, :] >= fitness[None, :, :]).all(-1)
+    gt = (fitness[:, None, :] > fitness[None, :, :]).any(-1)
+    dominates = ge & gt  # dominates[i, j]: i dominates j
+
+    # Count of dominators per solution; front k is whoever hits zero once
+    # fronts 0..k-1 are removed
+    counts = dominates.sum(0)
+    assigned = np.zeros(n, dtype=bool)
+    fronts = []
+
+    while not assigned.all():
+        current = (counts == 0) & ~assigned
+        if not current.any():
+            break  # Safety net; cannot happen with a finite fitness matrix
+
+        fronts.append([population_data[i] for i in np.flatnonzero(current)])
+        assigned |= current
+        counts -= dominates[current].sum(0)
+
+    return fronts
+
+
 class TileEmpireWorker(GodotWorker):
     """Tile Empire specific W&B worker"""
     
@@ -191,7 +230,7 @@ class TileEmpireWorker(GodotWorker):
             evolution.evolve_generation()
             
             # Log generation stats
-            fronts = NSGA2Selection.non_dominated_sort(population_data)
+            fronts = _non_dominated_sort(population_data)
             wandb.log({
                 'generation': generation,
                 'num_fronts': len(fronts),
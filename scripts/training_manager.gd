@@ -11,9 +11,32 @@ const NeuralNetwork = preload("res://scripts/ai/neural_network.gd")
 var genome_path: String = ""
 var metrics_path: String = ""
 var is_headless: bool = false
+var daemon_mode: bool = false
 var map_seed: int = -1
 var worker_id: String = ""
 
+# Stdout line prefix for daemon-mode metrics replies
+const DAEMON_METRICS_PREFIX = "##METRICS##"
+
+# IPC transport with the Python trainer: "file" or "shm" (Linux-only).
+# Layout must match overnight_evolve.py: length-prefixed genome blob at the
+# front, one length-prefixed metrics slot per episode in the tail region.
+var transport: String = "file"
+var shm_name: String = ""
+var shm_slot: int = 0
+
+const SHM_SIZE = 1048576
+const SHM_METRICS_OFFSET = SHM_SIZE - 256 * 1024
+const SHM_METRICS_SLOT_SIZE = 64 * 1024
+
+# Batch mode: one process evaluates a whole population of genomes,
+# one world after another, and writes an index-keyed metrics array
+var batch_mode: bool = false
+var genomes_path: String = ""
+var batch_genomes: Array = []
+var batch_index: int = 0
+var batch_results: Array = []
+
 # Training configuration
 var max_episode_ticks: int = 3000  # 50 seconds at 60 FPS
 var action_interval: int = 30  # AI acts every 0.5 seconds
@@ -56,12 +79,19 @@ func _ready():
 	actions = AgentActions.new()
 	fitness_calc = FitnessCalculator.new()
 	
-	# Load genome if provided
-	if genome_path != "":
+	# Load genome(s) if provided
+	if batch_mode:
+		_load_batch_genomes()
+	elif transport == "shm":
+		_load_genome_shm()
+	elif genome_path != "":
 		_load_genome()
-	
-	# Start training episode
-	call_deferred("start_episode")
+
+	# Start training episode (daemon mode waits for a request instead)
+	if daemon_mode:
+		call_deferred("_daemon_next_episode")
+	else:
+		call_deferred("start_episode")
 
 func _parse_command_line():
 	"""Parse command line arguments"""
@@ -91,6 +121,18 @@ func _parse_command_line():
 			map_size = args[i + 1]
 		elif arg == "--disable-cpu":
 			enable_cpu_opponents = false
+		elif arg == "--daemon":
+			daemon_mode = true
+		elif arg == "--transport" and i + 1 < args.size():
+			transport = args[i + 1]
+		elif arg == "--shm-name" and i + 1 < args.size():
+			shm_name = args[i + 1]
+		elif arg == "--shm-slot" and i + 1 < args.size():
+			shm_slot = int(args[i + 1])
+		elif arg == "--batch-mode":
+			batch_mode = true
+		elif arg == "--genomes-path" and i + 1 < args.size():
+			genomes_path = args[i + 1]
 
 func _load_genome():
 	"""Load NEAT genome from JSON file"""
@@ -118,6 +160,59 @@ func _load_genome():
 	print("Loaded genome with ", genome_data.get("nodes", []).size(), " nodes and ",
 		genome_data.get("connections", []).size(), " connections")
 
+func _load_batch_genomes():
+	"""Load the population array for batch mode and build the first network"""
+	var file = FileAccess.open(genomes_path, FileAccess.READ)
+	if not file:
+		push_error("Failed to open genomes file: " + genomes_path)
+		get_tree().quit(1)
+		return
+
+	var json = JSON.new()
+	var parse_result = json.parse(file.get_as_text())
+	file.close()
+
+	if parse_result != OK or not json.data is Array or json.data.is_empty():
+		push_error("Failed to parse genomes array: " + json.error_string)
+		get_tree().quit(1)
+		return
+
+	batch_genomes = json.data
+	batch_index = 0
+	batch_results = []
+
+	neural_net = NeuralNetwork.new()
+	neural_net.from_genome(batch_genomes[0])
+
+	print("Batch mode: ", batch_genomes.size(), " genomes to evaluate")
+
+func _shm_path() -> String:
+	return "/dev/shm/" + shm_name
+
+func _load_genome_shm():
+	"""Load NEAT genome from the shared-memory segment"""
+	var file = FileAccess.open(_shm_path(), FileAccess.READ)
+	if not file:
+		# Quit nonzero instead of carrying on: running the episode with no
+		# network would record real-looking metrics for a genome that was
+		# never loaded
+		push_error("Failed to open shared memory: " + _shm_path())
+		get_tree().quit(1)
+		return
+
+	var length = file.get_32()
+	var blob = file.get_buffer(length)
+	file.close()
+
+	var json = JSON.new()
+	if json.parse(blob.get_string_from_utf8()) != OK:
+		push_error("Failed to parse genome JSON from shared memory: " + json.error_string)
+		get_tree().quit(1)
+		return
+
+	neural_net = NeuralNetwork.new()
+	neural_net.from_genome(json.data)
+
 func start_episode():
 	"""Initialize a new training episode"""
 	print("Starting training episode...")
@@ -127,6 +222,7 @@ func start_episode():
 	episode_start_time = Time.get_ticks_msec() / 1000.0
 	agent_data.clear()
 	episode_data.clear()
+	cpu_opponents.clear()
 	
 	# Get or create game manager
 	game_manager = get_node_or_null("/root/GameManager")
@@ -360,17 +456,79 @@ func _finish_episode():
 		" P=", metrics.progression_score,
 		" S=", metrics.survival_score)
 	
-	# Write metrics to file
-	if metrics_path != "":
+	if batch_mode:
+		# Collect this genome's result and move on to the next world
+		metrics["genome_index"] = batch_index
+		batch_results.append(metrics)
+		batch_index += 1
+
+		# Rewrite the results file after every world so a crash or an
+		# external kill only loses the genome in flight, not the batch
+		_write_batch_results()
+
+		if batch_index < batch_genomes.size():
+			neural_net = NeuralNetwork.new()
+			neural_net.from_genome(batch_genomes[batch_index])
+			start_episode()
+		else:
+			get_tree().quit(0)
+		return
+
+	# Write metrics back to the trainer
+	if transport == "shm":
+		_write_metrics_shm(metrics)
+	elif metrics_path != "":
 		_write_metrics(metrics)
 	
 	# Emit signal
 	episode_finished.emit(metrics)
-	
-	# Quit if headless
-	if is_headless:
+
+	if daemon_mode:
+		# Hand metrics back over stdout, then block for the next request
+		print(DAEMON_METRICS_PREFIX + JSON.stringify(metrics))
+		_daemon_next_episode()
+	elif is_headless:
+		# Quit if headless
 		get_tree().quit(0)
 
+func _daemon_next_episode():
+	"""Block on stdin for the next episode request and start it"""
+	while true:
+		var line = OS.read_string_from_stdin().strip_edges()
+
+		if line == "":
+			# EOF - the controller is gone
+			get_tree().quit(0)
+			return
+
+		var json = JSON.new()
+		if json.parse(line) != OK:
+			push_error("Daemon: bad request JSON: " + json.error_string)
+			continue
+
+		var request = json.data
+		if request.get("quit", false):
+			get_tree().quit(0)
+			return
+
+		_daemon_apply_request(request)
+		start_episode()
+		return
+
+func _daemon_apply_request(request: Dictionary):
+	"""Apply per-episode parameters from a daemon request"""
+	map_seed = int(request.get("seed", -1))
+	max_episode_ticks = int(request.get("max_ticks", max_episode_ticks))
+	action_interval = int(request.get("action_interval", action_interval))
+	map_size = request.get("map_size", map_size)
+	enable_cpu_opponents = not request.get("disable_cpu", false)
+	if request.has("cpu_difficulty"):
+		cpu_difficulty = request["cpu_difficulty"]
+
+	# Build the network for this episode's genome
+	neural_net = NeuralNetwork.new()
+	neural_net.from_genome(request.get("genome", {}))
+
 func _write_metrics(metrics: Dictionary):
 	"""Write metrics to JSON file"""
 	var file = FileAccess.open(metrics_path, FileAccess.WRITE)
@@ -381,5 +539,37 @@ func _write_metrics(metrics: Dictionary):
 	var json_string = JSON.stringify(metrics, "\t")
 	file.store_string(json_string)
 	file.close()
-	
-	print("Metrics written to: ", metrics_path)
\ No newline at end of file
+
+	print("Metrics written to: ", metrics_path)
+
+func _write_batch_results():
+	"""Write the index-keyed metrics array for the batch so far"""
+	var file = FileAccess.open(metrics_path, FileAccess.WRITE)
+	if not file:
+		push_error("Failed to open metrics file: " + metrics_path)
+		return
+
+	file.store_string(JSON.stringify(batch_results))
+	file.close()
+
+	print("Batch metrics written to: ", metrics_path)
+
+func _write_metrics_shm(metrics: Dictionary):
+	"""Write metrics into this episode's shared-memory slot"""
+	var file = FileAccess.open(_shm_path(), FileAccess.READ_WRITE)
+	if not file:
+		push_error("Failed to open shared memory: " + _shm_path())
+		return
+
+	var blob = JSON.stringify(metrics).to_utf8_buffer()
+	if blob.size() + 4 > SHM_METRICS_SLOT_SIZE:
+		push_error("Metrics blob too large for shared-memory slot")
+		file.close()
+		return
+
+	file.seek(SHM_METRICS_OFFSET + shm_slot * SHM_METRICS_SLOT_SIZE)
+	file.store_32(blob.size())
+	file.store_buffer(blob)
+	file.close()
+
+	print("Metrics written to shared memory slot ", shm_slot)
\ No newline at end of file